@@ -33,7 +33,7 @@ class ClassFile:
         self.attributes = attributes
 
     @classmethod
-    def parse(cls, fp):
+    def parse(cls, fp, lazy=False):
         (
             magic,
             minor_version,
@@ -64,17 +64,17 @@ class ClassFile:
         fields_count = struct.unpack(">H", fp.read(2))[0]
         fields = []
         for _ in range(fields_count):
-            fields.append(Field.parse(fp, constant_pool))
+            fields.append(Field.parse(fp, constant_pool, lazy))
 
         methods_count = struct.unpack(">H", fp.read(2))[0]
         methods = []
         for _ in range(methods_count):
-            methods.append(Method.parse(fp, constant_pool))
+            methods.append(Method.parse(fp, constant_pool, lazy))
 
         attributes_count = struct.unpack(">H", fp.read(2))[0]
         attributes = []
         for _ in range(attributes_count):
-            attributes.append(Attribute.parse(fp, constant_pool))
+            attributes.append(Attribute.parse(fp, constant_pool, lazy))
 
         return cls(
             major_version,
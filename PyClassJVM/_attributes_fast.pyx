@@ -0,0 +1,73 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+
+from cpython.array cimport array, clone
+
+cdef array _U16 = array("H")
+
+
+cdef inline unsigned short _u16(const unsigned char *p) noexcept nogil:
+    return (p[0] << 8) | p[1]
+
+
+cdef const unsigned char *_rows(
+    const unsigned char[::1] buf, Py_ssize_t offset, Py_ssize_t count, Py_ssize_t width
+) except NULL:
+    if offset < 0 or count < 0 or offset + count * width > buf.shape[0]:
+        raise ValueError("attribute table extends past the end of the buffer")
+
+    return &buf[0] + offset
+
+
+def parse_line_number_table(const unsigned char[::1] buf, Py_ssize_t offset, Py_ssize_t count):
+    cdef array start_pcs = clone(_U16, count, False)
+    cdef array line_numbers = clone(_U16, count, False)
+    cdef Py_ssize_t i
+
+    if count == 0:
+        return start_pcs, line_numbers
+
+    cdef const unsigned char *p = _rows(buf, offset, count, 4)
+    for i in range(count):
+        start_pcs.data.as_ushorts[i] = _u16(p)
+        line_numbers.data.as_ushorts[i] = _u16(p + 2)
+        p += 4
+
+    return start_pcs, line_numbers
+
+
+def parse_local_variable_table(const unsigned char[::1] buf, Py_ssize_t offset, Py_ssize_t count):
+    cdef array start_pcs = clone(_U16, count, False)
+    cdef array line_numbers = clone(_U16, count, False)
+    cdef array name_indexes = clone(_U16, count, False)
+    cdef array descriptor_indexes = clone(_U16, count, False)
+    cdef array indexes = clone(_U16, count, False)
+    cdef Py_ssize_t i
+
+    if count == 0:
+        return start_pcs, line_numbers, name_indexes, descriptor_indexes, indexes
+
+    cdef const unsigned char *p = _rows(buf, offset, count, 10)
+    for i in range(count):
+        start_pcs.data.as_ushorts[i] = _u16(p)
+        line_numbers.data.as_ushorts[i] = _u16(p + 2)
+        name_indexes.data.as_ushorts[i] = _u16(p + 4)
+        descriptor_indexes.data.as_ushorts[i] = _u16(p + 6)
+        indexes.data.as_ushorts[i] = _u16(p + 8)
+        p += 10
+
+    return start_pcs, line_numbers, name_indexes, descriptor_indexes, indexes
+
+
+def parse_inner_classes(const unsigned char[::1] buf, Py_ssize_t offset, Py_ssize_t count):
+    cdef list rows = []
+    cdef Py_ssize_t i
+
+    if count == 0:
+        return rows
+
+    cdef const unsigned char *p = _rows(buf, offset, count, 8)
+    for i in range(count):
+        rows.append((_u16(p), _u16(p + 2), _u16(p + 4), _u16(p + 6)))
+        p += 8
+
+    return rows
@@ -1,51 +1,215 @@
 import abc
-import io
+import array
+import functools
+import linecache
 import struct
+import sys
 
 from .attribute_helpers import LineNumber, LocalVariable, LocalVariableType, InnerClass
 from .flags import InnerClassAccessFlags
 
+_H = struct.Struct(">H")
+_HH = struct.Struct(">HH")
+_HI = struct.Struct(">HI")
+_HHI = struct.Struct(">HHI")
+_HHHH = struct.Struct(">HHHH")
+
+
+def _u16_array(buf, offset, count):
+    arr = array.array("H")
+    arr.frombytes(buf[offset : offset + 2 * count])
+    if sys.byteorder == "little":
+        arr.byteswap()
+
+    return arr
+
+
+def _u16_columns(buf, offset, count, width):
+    rows = _u16_array(buf, offset, count * width)
+    return tuple(rows[column::width] for column in range(width))
+
+
+def _u16_columns_of(rows, fields):
+    return tuple(
+        array.array("H", [getattr(row, field) for row in rows]) for field in fields
+    )
+
+
+try:
+    from ._attributes_fast import (
+        parse_inner_classes as _inner_class_rows,
+        parse_line_number_table as _line_number_columns,
+        parse_local_variable_table as _local_variable_columns,
+    )
+except ImportError:
+
+    def _line_number_columns(buf, offset, count):
+        return _u16_columns(buf, offset, count, 2)
+
+    def _local_variable_columns(buf, offset, count):
+        return _u16_columns(buf, offset, count, 5)
+
+    def _inner_class_rows(buf, offset, count):
+        return _HHHH.iter_unpack(buf[offset : offset + 8 * count])
+
+
+@functools.lru_cache(maxsize=None)
+def _inner_class_access_flags(value):
+    return InnerClassAccessFlags(value)
+
+
+def _exception_rows(buf, offset, count):
+    return list(_HHHH.iter_unpack(buf[offset : offset + 8 * count]))
+
+
+def _read_table(name, buf, offset, row_size, read_rows):
+    count = _H.unpack_from(buf, offset)[0]
+    offset += 2
+    if offset + row_size * count > len(buf):
+        raise ValueError(f"Truncated {name.value} attribute")
+
+    return read_rows(buf, offset, count), offset + row_size * count
+
+
+def _compile_parser(cls):
+    fields = [field for _, field in cls._layout]
+    arguments = ["name"]
+    for kind, field in cls._layout:
+        if kind != "cp":
+            raise ValueError(f"Unknown layout field kind: {kind}")
+
+        arguments.append(f"constant_pool[{field} - 1]")
+
+    source = ["def _parse(cls, name, buf, offset, constant_pool):"]
+    if fields:
+        source.append(
+            f"    {', '.join(fields)}, = _layout_struct.unpack_from(buf, offset)"
+        )
+
+    source.append(f"    return cls({', '.join(arguments)}), offset + {2 * len(fields)}")
+    source = "\n".join(source) + "\n"
+
+    filename = f"<{cls.__name__}._parse>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    cls._parse_source = source
+
+    namespace = {"_layout_struct": struct.Struct(">" + "H" * len(fields))}
+    exec(compile(source, filename, "exec"), namespace)
+    return classmethod(namespace["_parse"])
+
 
 class Attribute(abc.ABC):
     def __init__(self, name, info):
         self.name = name
         self.info = info
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_layout" in cls.__dict__:
+            cls._parse = _compile_parser(cls)
+
     @classmethod
     @abc.abstractmethod
-    def _parse(cls, name, fp, constant_pool):
+    def _parse(cls, name, buf, offset, constant_pool):
         pass
 
     @classmethod
-    def parse(cls, fp, constant_pool):
-        name_index, attribute_length = struct.unpack(">HI", fp.read(6))
+    def parse(cls, fp, constant_pool, lazy=False):
+        try:
+            name_index, attribute_length = _HI.unpack(fp.read(6))
+        except struct.error:
+            raise ValueError("Truncated attribute header") from None
+
         name = constant_pool[name_index - 1]
         info = fp.read(attribute_length)
+        if len(info) != attribute_length:
+            raise ValueError(f"Truncated {name.value} attribute")
+
+        if lazy:
+            return LazyAttribute(name, info, constant_pool)
+
+        return Attribute._create(name, memoryview(info), constant_pool)
+
+    @staticmethod
+    def _parse_from(buf, offset, constant_pool):
+        try:
+            name_index, attribute_length = _HI.unpack_from(buf, offset)
+        except struct.error:
+            raise ValueError("Truncated attribute header") from None
+
+        offset += 6
+        end = offset + attribute_length
+        name = constant_pool[name_index - 1]
+        if end > len(buf):
+            raise ValueError(f"Truncated {name.value} attribute")
+
+        return Attribute._create(name, buf[offset:end], constant_pool), end
+
+    @staticmethod
+    def _create(name, buf, constant_pool):
+        # Every malformed attribute body surfaces here as ValueError: reads
+        # past the end of info are "Truncated", bytes left unparsed are
+        # "Trailing data".
+        subclass = name._attr_cls
+        if subclass is None:
+            subclass = name._attr_cls = _DISPATCH.get(name.value, UnknownAttribute)
+
+        try:
+            attribute, end = subclass._parse(name, buf, 0, constant_pool)
+        except struct.error:
+            raise ValueError(f"Truncated {name.value} attribute") from None
+
+        if end > len(buf):
+            raise ValueError(f"Truncated {name.value} attribute")
 
-        for subclass in cls.__subclasses__():
-            if subclass.__name__ == f"Attribute_{name.value}":
-                return subclass._parse(name, io.BytesIO(info), constant_pool)
+        if end < len(buf):
+            raise ValueError(f"Trailing data in {name.value} attribute")
 
-        return UnknownAttribute(name, info)
+        return attribute
 
 
 class UnknownAttribute(Attribute):
     @classmethod
-    def _parse(cls, name, info):
-        return cls(name, info)
+    def _parse(cls, name, buf, offset, constant_pool):
+        return cls(name, bytes(buf[offset:])), len(buf)
+
+
+class LazyAttribute:
+    __slots__ = ("name", "_info", "_constant_pool", "_parsed")
+
+    def __init__(self, name, info, constant_pool):
+        self.name = name
+        self._info = info
+        self._constant_pool = constant_pool
+        self._parsed = None
+
+    @property
+    def parsed(self):
+        if self._parsed is None:
+            self._parsed = Attribute._create(
+                self.name, memoryview(self._info), self._constant_pool
+            )
+            self._info = self._constant_pool = None
+
+        return self._parsed
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.parsed, name)
+
+    def __repr__(self):
+        return f"LazyAttribute(name={self.name.value!r})"
 
 
 class Attribute_ConstantValue(Attribute):
+    _layout = (("cp", "constant_value_index"),)
+
     def __init__(self, name, constant_value):
         self.name = name
         self.constant_value = constant_value
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        constant_value_index = struct.unpack(">H", fp.read(2))[0]
-        constant_value = constant_pool[constant_value_index - 1]
-        return cls(name, constant_value)
-
 
 class Attribute_Code(Attribute):
     def __init__(self, name, max_stack, max_locals, code, exception_table, attributes):
@@ -57,23 +221,27 @@ class Attribute_Code(Attribute):
         self.attributes = attributes
 
     @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        max_stack, max_locals, code_length = struct.unpack(">HHI", fp.read(8))
-        code = fp.read(code_length)
-
-        exception_table_length = struct.unpack(">H", fp.read(2))[0]
+    def _parse(cls, name, buf, offset, constant_pool):
+        max_stack, max_locals, code_length = _HHI.unpack_from(buf, offset)
+        offset += 8
+        code = bytes(buf[offset : offset + code_length])
+        offset += code_length
 
-        exception_table = []
-        for _ in range(exception_table_length):
-            exception_table.append(struct.unpack(">HHHH", fp.read(8)))
+        exception_table, offset = _read_table(name, buf, offset, 8, _exception_rows)
 
-        attributes_count = struct.unpack(">H", fp.read(2))[0]
+        attributes_count = _H.unpack_from(buf, offset)[0]
+        offset += 2
         attributes = []
 
+        parse = Attribute._parse_from
         for _ in range(attributes_count):
-            attributes.append(Attribute.parse(fp, constant_pool))
+            attribute, offset = parse(buf, offset, constant_pool)
+            attributes.append(attribute)
 
-        return cls(name, max_stack, max_locals, code, exception_table, attributes)
+        return (
+            cls(name, max_stack, max_locals, code, exception_table, attributes),
+            offset,
+        )
 
 
 class Attribute_Exceptions(Attribute):
@@ -82,13 +250,9 @@ class Attribute_Exceptions(Attribute):
         self.exception_index_table = exception_index_table
 
     @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        exception_index_table = []
-        number_of_exceptions = struct.unpack(">H", fp.read(2))[0]
-        for _ in range(number_of_exceptions):
-            exception_index_table.append(struct.unpack(">H", fp.read(2))[0])
-
-        return cls(name, exception_index_table)
+    def _parse(cls, name, buf, offset, constant_pool):
+        exception_index_table, offset = _read_table(name, buf, offset, 2, _u16_array)
+        return cls(name, exception_index_table.tolist()), offset
 
 
 class Attribute_InnerClasses(Attribute):
@@ -97,74 +261,57 @@ class Attribute_InnerClasses(Attribute):
         self.inner_classes = inner_classes
 
     @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        inner_classes = []
-        number_of_classes = struct.unpack(">H", fp.read(2))[0]
-        for _ in range(number_of_classes):
-            (
+    def _parse(cls, name, buf, offset, constant_pool):
+        rows, offset = _read_table(name, buf, offset, 8, _inner_class_rows)
+        inner_classes = [
+            InnerClass(
+                constant_pool[inner_class_info_index - 1],
+                constant_pool[outer_class_info_index - 1],
+                constant_pool[inner_name_index - 1],
+                _inner_class_access_flags(inner_class_access_flags),
+            )
+            for (
                 inner_class_info_index,
                 outer_class_info_index,
                 inner_name_index,
                 inner_class_access_flags,
-            ) = struct.unpack(">HHHH", fp.read(8))
-            inner_classes.append(
-                InnerClass(
-                    constant_pool[inner_class_info_index - 1],
-                    constant_pool[outer_class_info_index - 1],
-                    constant_pool[inner_name_index - 1],
-                    InnerClassAccessFlags(inner_class_access_flags),
-                )
-            )
+            ) in rows
+        ]
 
-        return cls(name, inner_classes)
+        return cls(name, inner_classes), offset
 
 
 class Attribute_EnclosingMethod(Attribute):
+    _layout = (("cp", "class_index"), ("cp", "method_index"))
+
     def __init__(self, name, class_, method):
         self.name = name
         self.class_ = class_
         self.method = method
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        class_index, method_index = struct.unpack(">HH", fp.read(4))
-        return cls(
-            name, constant_pool[class_index - 1], constant_pool[method_index - 1]
-        )
-
 
 class Attribute_Synthetic(Attribute):
+    _layout = ()
+
     def __init__(self, name):
         self.name = name
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        return cls(name)
-
 
 class Attribute_Signature(Attribute):
+    _layout = (("cp", "signature_index"),)
+
     def __init__(self, name, signature):
         self.name = name
         self.signature = signature
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        signature_index = struct.unpack(">H", fp.read(2))[0]
-        signature = constant_pool[signature_index - 1]
-        return cls(name, signature)
-
 
 class Attribute_SourceFile(Attribute):
+    _layout = (("cp", "sourcefile_index"),)
+
     def __init__(self, name, sourcefile):
         self.name = name
         self.sourcefile = sourcefile
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        sourcefile_index = struct.unpack(">H", fp.read(2))[0]
-        sourcefile = constant_pool[sourcefile_index - 1]
-        return cls(name, sourcefile)
-
 
 class Attribute_SourceDebugExtension(Attribute):
     def __init__(self, name, debug_extension):
@@ -172,70 +319,172 @@ class Attribute_SourceDebugExtension(Attribute):
         self.debug_extension = debug_extension
 
     @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        debug_extension = fp.read()
-        return cls(name, debug_extension)
+    def _parse(cls, name, buf, offset, constant_pool):
+        debug_extension = bytes(buf[offset:])
+        return cls(name, debug_extension), len(buf)
 
 
 class Attribute_LineNumberTable(Attribute):
-    def __init__(self, name, line_number_table):
+    def __init__(self, name, start_pcs, line_numbers):
         self.name = name
-        self.line_number_table = line_number_table
+        self.start_pcs = start_pcs
+        self.line_numbers = line_numbers
+        self._line_number_table = None
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        line_number_table_length = struct.unpack(">H", fp.read(2))[0]
+    def __getitem__(self, index):
+        if self._line_number_table is not None or isinstance(index, slice):
+            return self.line_number_table[index]
 
-        line_number_table = []
-        for _ in range(line_number_table_length):
-            line_number_table.append(LineNumber(*struct.unpack(">HH", fp.read(4))))
+        return LineNumber(self.start_pcs[index], self.line_numbers[index])
 
-        return cls(name, line_number_table)
+    @property
+    def line_number_table(self):
+        if self._line_number_table is None:
+            self._line_number_table = list(
+                map(LineNumber._make, zip(self.start_pcs, self.line_numbers))
+            )
 
+        return self._line_number_table
 
-class Attribute_LocalVariableTable(Attribute):
-    def __init__(self, name, local_variable_table):
-        self.name = name
-        self.local_variable_table = local_variable_table
+    @line_number_table.setter
+    def line_number_table(self, line_number_table):
+        self._line_number_table = line_number_table
+        self.start_pcs, self.line_numbers = _u16_columns_of(
+            line_number_table, ("start_pc", "line_number")
+        )
 
     @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        local_variable_table_length = struct.unpack(">H", fp.read(2))[0]
+    def _parse(cls, name, buf, offset, constant_pool):
+        columns, offset = _read_table(name, buf, offset, 4, _line_number_columns)
+        return cls(name, *columns), offset
 
-        local_variable_table = []
-        for _ in range(local_variable_table_length):
-            local_variable_table.append(
-                LocalVariable(*struct.unpack(">HHHHH", fp.read(10)))
-            )
 
-        return cls(name, local_variable_table)
+class Attribute_LocalVariableTable(Attribute):
+    def __init__(
+        self, name, start_pcs, lengths, name_indexes, descriptor_indexes, indexes
+    ):
+        self.name = name
+        self.start_pcs = start_pcs
+        self.lengths = lengths
+        self.name_indexes = name_indexes
+        self.descriptor_indexes = descriptor_indexes
+        self.indexes = indexes
+        self._local_variable_table = None
+
+    def __getitem__(self, index):
+        if self._local_variable_table is not None or isinstance(index, slice):
+            return self.local_variable_table[index]
+
+        return LocalVariable(
+            self.start_pcs[index],
+            self.lengths[index],
+            self.name_indexes[index],
+            self.descriptor_indexes[index],
+            self.indexes[index],
+        )
+
+    @property
+    def local_variable_table(self):
+        if self._local_variable_table is None:
+            self._local_variable_table = [
+                LocalVariable(*row)
+                for row in zip(
+                    self.start_pcs,
+                    self.lengths,
+                    self.name_indexes,
+                    self.descriptor_indexes,
+                    self.indexes,
+                )
+            ]
+
+        return self._local_variable_table
+
+    @local_variable_table.setter
+    def local_variable_table(self, local_variable_table):
+        self._local_variable_table = local_variable_table
+        (
+            self.start_pcs,
+            self.lengths,
+            self.name_indexes,
+            self.descriptor_indexes,
+            self.indexes,
+        ) = _u16_columns_of(
+            local_variable_table,
+            ("start_pc", "line_number", "name_index", "descriptor_index", "index"),
+        )
+
+    @classmethod
+    def _parse(cls, name, buf, offset, constant_pool):
+        columns, offset = _read_table(name, buf, offset, 10, _local_variable_columns)
+        return cls(name, *columns), offset
 
 
 class Attribute_LocalVariableTypeTable(Attribute):
-    def __init__(self, name, local_variable_type_table):
+    def __init__(
+        self, name, start_pcs, lengths, name_indexes, signature_indexes, indexes
+    ):
         self.name = name
-        self.local_variable_type_table = local_variable_type_table
+        self.start_pcs = start_pcs
+        self.lengths = lengths
+        self.name_indexes = name_indexes
+        self.signature_indexes = signature_indexes
+        self.indexes = indexes
+        self._local_variable_type_table = None
+
+    def __getitem__(self, index):
+        if self._local_variable_type_table is not None or isinstance(index, slice):
+            return self.local_variable_type_table[index]
+
+        return LocalVariableType(
+            self.start_pcs[index],
+            self.lengths[index],
+            self.name_indexes[index],
+            self.signature_indexes[index],
+            self.indexes[index],
+        )
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        local_variable_type_table_length = struct.unpack(">H", fp.read(2))[0]
+    @property
+    def local_variable_type_table(self):
+        if self._local_variable_type_table is None:
+            self._local_variable_type_table = [
+                LocalVariableType(*row)
+                for row in zip(
+                    self.start_pcs,
+                    self.lengths,
+                    self.name_indexes,
+                    self.signature_indexes,
+                    self.indexes,
+                )
+            ]
+
+        return self._local_variable_type_table
+
+    @local_variable_type_table.setter
+    def local_variable_type_table(self, local_variable_type_table):
+        self._local_variable_type_table = local_variable_type_table
+        (
+            self.start_pcs,
+            self.lengths,
+            self.name_indexes,
+            self.signature_indexes,
+            self.indexes,
+        ) = _u16_columns_of(
+            local_variable_type_table,
+            ("start_pc", "line_number", "name_index", "signature_index", "index"),
+        )
 
-        local_variable_type_table = []
-        for _ in range(local_variable_type_table_length):
-            local_variable_type_table.append(
-                LocalVariableType(*struct.unpack(">HHHHH", fp.read(10)))
-            )
-        return cls(name, local_variable_type_table)
+    @classmethod
+    def _parse(cls, name, buf, offset, constant_pool):
+        columns, offset = _read_table(name, buf, offset, 10, _local_variable_columns)
+        return cls(name, *columns), offset
 
 
 class Attribute_Deprecated(Attribute):
+    _layout = ()
+
     def __init__(self, name):
         self.name = name
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        return cls(name)
-
 
 class Attribute_BootstrapMethods(Attribute):
     def __init__(self, name, bootstrap_methods):
@@ -243,27 +492,33 @@ class Attribute_BootstrapMethods(Attribute):
         self.bootstrap_methods = bootstrap_methods
 
     @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        num_bootstrap_methods = struct.unpack(">H", fp.read(2))[0]
+    def _parse(cls, name, buf, offset, constant_pool):
+        num_bootstrap_methods = _H.unpack_from(buf, offset)[0]
+        offset += 2
+
+        unpack_method = _HH.unpack_from
 
         bootstrap_methods = []
         for _ in range(num_bootstrap_methods):
             (
                 bootstrap_method_ref,
                 num_bootstrap_arguments,
-            ) = struct.unpack(">HH", fp.read(4))
+            ) = unpack_method(buf, offset)
+            offset += 4
 
-            bootstrap_arguments = []
-            for _ in range(num_bootstrap_arguments):
-                bootstrap_arguments.append(
-                    constant_pool[struct.unpack(">H", fp.read(2))[0] - 1]
+            bootstrap_arguments = [
+                constant_pool[bootstrap_argument - 1]
+                for bootstrap_argument in _u16_array(
+                    buf, offset, num_bootstrap_arguments
                 )
+            ]
+            offset += 2 * num_bootstrap_arguments
 
             bootstrap_methods.append(
                 (constant_pool[bootstrap_method_ref - 1], bootstrap_arguments)
             )
 
-        return cls(name, bootstrap_methods)
+        return cls(name, bootstrap_methods), offset
 
 
 class Attribute_ModulePackages(Attribute):
@@ -272,35 +527,33 @@ class Attribute_ModulePackages(Attribute):
         self.package_index_table = package_index_table
 
     @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        package_count = struct.unpack(">H", fp.read(2))[0]
-
-        package_index_table = []
-        for _ in range(package_count):
-            package_index_table.append(
-                constant_pool[struct.unpack(">H", fp.read(2))[0] - 1]
-            )
+    def _parse(cls, name, buf, offset, constant_pool):
+        package_indexes, offset = _read_table(name, buf, offset, 2, _u16_array)
+        package_index_table = [
+            constant_pool[package_index - 1] for package_index in package_indexes
+        ]
 
-        return cls(name, package_index_table)
+        return cls(name, package_index_table), offset
 
 
 class Attribute_ModuleMainClass(Attribute):
+    _layout = (("cp", "main_class_index"),)
+
     def __init__(self, name, main_class):
         self.name = name
         self.main_class = main_class
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        main_class_index = struct.unpack(">H", fp.read(2))[0]
-        return cls(name, constant_pool[main_class_index - 1])
-
 
 class Attribute_NestHost(Attribute):
+    _layout = (("cp", "host_class_index"),)
+
     def __init__(self, name, host_class):
         self.name = name
         self.host_class = host_class
 
-    @classmethod
-    def _parse(cls, name, fp, constant_pool):
-        host_class_index = struct.unpack(">H", fp.read(2))[0]
-        return cls(name, constant_pool[host_class_index - 1])
+
+_DISPATCH = {
+    subclass.__name__.removeprefix("Attribute_"): subclass
+    for subclass in Attribute.__subclasses__()
+    if subclass is not UnknownAttribute
+}
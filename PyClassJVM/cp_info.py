@@ -156,6 +156,7 @@ class CONSTANT_NameAndType(CONSTANT):
 
 class CONSTANT_Utf8(CONSTANT):
     _tag = 1
+    _attr_cls = None
 
     def __init__(self, value):
         self.value = value
@@ -13,7 +13,7 @@ class Field:
         self.attributes = attributes
 
     @classmethod
-    def parse(cls, fp, constant_pool):
+    def parse(cls, fp, constant_pool, lazy=False):
         (
             access_flags,
             name_index,
@@ -27,7 +27,7 @@ class Field:
 
         attributes = []
         for _ in range(attributes_count):
-            attributes.append(Attribute.parse(fp, constant_pool))
+            attributes.append(Attribute.parse(fp, constant_pool, lazy))
 
         return cls(
             FieldAccessFlags(access_flags),
@@ -12,7 +12,7 @@ class Method:
         self.attributes = attributes
 
     @staticmethod
-    def parse(fp, constant_pool):
+    def parse(fp, constant_pool, lazy=False):
         (
             access_flags,
             name_index,
@@ -24,7 +24,7 @@ class Method:
 
         attributes = []
         for _ in range(attributes_count):
-            attributes.append(Attribute.parse(fp, constant_pool))
+            attributes.append(Attribute.parse(fp, constant_pool, lazy))
 
         name = constant_pool[name_index - 1]
         descriptor = constant_pool[descriptor_index - 1]
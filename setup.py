@@ -0,0 +1,18 @@
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [
+            Extension(
+                "PyClassJVM._attributes_fast",
+                ["PyClassJVM/_attributes_fast.pyx"],
+                optional=True,
+            )
+        ]
+    )
+
+setup(ext_modules=ext_modules)